@@ -10,10 +10,19 @@ allowing users to specify full command prefixes with arguments in the config.
 
 import os
 import sys
+import argparse
+import asyncio
 import subprocess as sp
+import multiprocessing as mp
 import random
 import json
 import time
+import select
+import shlex
+import socket
+import string
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from tqdm import tqdm
 from datetime import datetime
 from pathlib import Path
@@ -28,6 +37,22 @@ ELLE_ERROR = "ERROR"
 ELLE_ANOMALY_KEYWORD = "false"  # In Elle's output, 'false' means no anomalies were found.
 ELLE_REALTIME_KEYWORD = "realtime"  # Substring in violation filenames for realtime anomalies.
 
+# Readiness probing backoff, in seconds.
+READY_BACKOFF_START = 0.01
+READY_BACKOFF_MAX = 0.5
+READY_CONNECT_TIMEOUT = 0.1
+
+# Server shutdown, in seconds.
+SHUTDOWN_ATTEMPTS = 6
+SHUTDOWN_CMD_TIMEOUT = 10
+SHUTDOWN_RETRY_INTERVAL = 1
+SERVER_EXIT_TIMEOUT = 10
+
+
+# --- Exceptions ---
+class ServerShutdownError(RuntimeError):
+    """Raised when the DBMS server cannot be shut down. Aborts the whole run."""
+
 
 # --- Configuration Class ---
 class FuzzConfig:
@@ -46,14 +71,31 @@ class FuzzConfig:
         self.shutdown_cmd: str = config_data['shutdown-cmd']
         self.check_ready_cmd: str = config_data['check-ready-cmd']
 
+        # Commands are tokenized once and executed without a shell.
+        self.prog_bin_argv: list[str] = shlex.split(self.prog_bin)
+        self.elle_bin_argv: list[str] = shlex.split(self.elle_bin)
+        self.edn_maker_bin_argv: list[str] = shlex.split(self.edn_maker_bin)
+        self.workload_bin_argv: list[str] = shlex.split(self.workload_bin)
+        self.shutdown_cmd_argv: list[str] = shlex.split(self.shutdown_cmd)
+        self.check_ready_cmd_argv: list[str] = shlex.split(self.check_ready_cmd)
+
         # --- Fuzzing parameters with sane defaults. ---
         self.iterations: int = config_data.get('iterations', 100)
         self.base_log_dir: Path = Path(config_data.get('base_log_dir', './fuzz_logs'))
         self.server_ready_timeout: int = config_data.get('server_ready_timeout', 30)
+        # First port of the per-worker port range. Worker N is handed base_port + N via ISOFUZZ_PORT.
+        self.base_port: Optional[int] = config_data.get('base_port')
+        # If set, readiness is probed with a TCP connect instead of check-ready-cmd.
+        # Like base_port, the worker slot is added to it.
+        self.ready_host: str = config_data.get('ready_host', '127.0.0.1')
+        self.ready_port: Optional[int] = config_data.get('ready_port')
 
         # --- Mutation strategy ---
         self.should_mutate: bool = config_data.get('mutate', False)
         self.max_mutate_budget: int = config_data.get('max_mutate_budget', 16)
+        # How many mutation budgets of one trace may be checked at the same time. Each verify
+        # worker runs this many translator/Elle pairs, so speculation is opt-in.
+        self.mutate_in_flight: int = max(1, config_data.get('mutate_in_flight', 1))
 
         # NOTE: We no longer validate path existence here, as the values can be
         # full commands with arguments. The responsibility is on the user
@@ -66,7 +108,7 @@ class FuzzState:
 
     def __init__(self):
         self.start_time: str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.iteration_logs: list[str] = []
+        self.completed: int = 0
         self.counts: dict[str, int] = {
             ELLE_OK: 0,
             ELLE_VIOLATION: 0,
@@ -74,81 +116,165 @@ class FuzzState:
             ELLE_ERROR: 0
         }
         self.mutation_stats: dict[int, int] = {}
+        # Iteration log lines keyed by iteration; results can arrive out of order.
+        self.log_entries: dict[int, str] = {}
 
 
-# --- Main Runner Class ---
-class FuzzRunner:
-    """Orchestrates the main fuzzing loop."""
+# --- Per-Worker State ---
+# Slot of the current worker process, handed out by the pool initializer. Each slot
+# owns its own port (see FuzzConfig.base_port) for as long as the worker lives.
+_worker_slot: int = 0
 
-    def __init__(self, config: FuzzConfig):
-        self.config = config
-        self.state = FuzzState()
-        random.seed(42)  # Initialize for reproducibility
-        self.config.base_log_dir.mkdir(parents=True, exist_ok=True)
-        print("FuzzRunner initialized. Log directory:", self.config.base_log_dir)
 
-    def _run_command(self, cmd: str, env: Optional[dict] = None, timeout: Optional[int] = None) -> sp.CompletedProcess:
-        """Helper to run a command with shell=True, capturing output."""
+def _init_worker(slot_queue):
+    """Pool initializer: claim a unique slot for this worker process."""
+    global _worker_slot
+    _worker_slot = slot_queue.get()
+
+
+def _expand_argv(argv: list[str], env: dict) -> list[str]:
+    """Substitute $VAR and ${VAR} references and a leading ~ in each argument, as the shell used to."""
+    argv = [string.Template(arg).safe_substitute(env) if '$' in arg else arg for arg in argv]
+    return [os.path.expanduser(arg) if arg.startswith('~') else arg for arg in argv]
+
+
+def _open_pidfd(pid: int) -> Optional[int]:
+    """Return a pidfd for the process, or None where pidfd_open is unavailable (non-Linux, Python < 3.9)."""
+    if not hasattr(os, "pidfd_open"):
+        return None
+    try:
+        return os.pidfd_open(pid)
+    except OSError:
+        return None
+
+
+def _wait_for_exit(process: sp.Popen, pidfd: Optional[int], timeout: float) -> bool:
+    """Block for up to `timeout` seconds until the process exits. Returns True if it did."""
+    if pidfd is not None:
+        poller = select.poll()
+        poller.register(pidfd, select.POLLIN)
+        return bool(poller.poll(timeout * 1000))
+    try:
+        process.wait(timeout=timeout)
+        return True
+    except sp.TimeoutExpired:
+        return False
+
+
+# --- Iteration Worker Class ---
+class FuzzWorker:
+    """Runs a single fuzzing iteration: server, workload, translation and verification."""
+
+    def __init__(self, config: FuzzConfig, slot: Optional[int] = None):
+        self.config = config
+        # Only server-stage workers own a slot; verify-stage commands get no slot environment.
+        self.slot_env: dict[str, int] = {}
+        self.ready_port: Optional[int] = None
+        if slot is not None:
+            self.slot_env["ISOFUZZ_SLOT"] = slot
+            if config.base_port is not None:
+                self.slot_env["ISOFUZZ_PORT"] = config.base_port + slot
+            if config.ready_port is not None:
+                self.ready_port = config.ready_port + slot
+
+    def _command_env(self, env: Optional[dict] = None) -> dict[str, str]:
+        """The environment configured commands run with and are expanded against."""
         full_env = os.environ.copy()
+        full_env.update({k: str(v) for k, v in self.slot_env.items()})
         if env:
             full_env.update({k: str(v) for k, v in env.items()})
-        return sp.run(cmd, shell=True, capture_output=True, text=True, env=full_env, timeout=timeout)
-
-    def _wait_for_server_ready(self) -> bool:
-        """Wait for the DBMS server to be ready for connections."""
-        start = time.time()
-        while time.time() - start < self.config.server_ready_timeout:
-            result = self._run_command(self.config.check_ready_cmd)
-            if result.returncode == 0:
+        return full_env
+
+    def _run_command(self, argv: list[str], env: Optional[dict] = None, timeout: Optional[int] = None) -> sp.CompletedProcess:
+        """Helper to run a command without a shell, capturing output."""
+        full_env = self._command_env(env)
+        return sp.run(_expand_argv(argv, full_env), capture_output=True, text=True, env=full_env, timeout=timeout)
+
+    def _probe_ready(self) -> bool:
+        """Check once whether the server accepts connections."""
+        if self.ready_port is None:
+            return self._run_command(self.config.check_ready_cmd_argv).returncode == 0
+        try:
+            with socket.create_connection((self.config.ready_host, self.ready_port), timeout=READY_CONNECT_TIMEOUT):
                 return True
-            time.sleep(0.5)
+        except OSError:
+            return False
+
+    def _wait_for_server_ready(self, server_process: sp.Popen, pidfd: Optional[int]) -> bool:
+        """Wait for the DBMS server to be ready for connections, giving up early if it exits."""
+        deadline = time.monotonic() + self.config.server_ready_timeout
+        delay = READY_BACKOFF_START
+        while time.monotonic() < deadline:
+            if self._probe_ready():
+                return True
+            # Sleeping on the pidfd doubles as exit detection.
+            if _wait_for_exit(server_process, pidfd, delay):
+                return False
+            delay = min(delay * 2, READY_BACKOFF_MAX)
         return False
 
-    def _shutdown_server_with_retries(self, iteration: int):
-        """Attempt to shut down the server, retrying with exponential backoff."""
-        for i in range(6):
+    def _shutdown_server_with_retries(self, server_process: sp.Popen, pidfd: Optional[int], iteration: int):
+        """Attempt to shut down the server, retrying as soon as a failed attempt is known not to have worked."""
+        for i in range(SHUTDOWN_ATTEMPTS):
+            if server_process.poll() is not None:
+                return
             try:
-                result = self._run_command(self.config.shutdown_cmd, timeout=10)
+                result = self._run_command(self.config.shutdown_cmd_argv, timeout=SHUTDOWN_CMD_TIMEOUT)
                 if result.returncode == 0:
                     return
             except sp.TimeoutExpired:
-                print(f"Shutdown command timed out at iteration {iteration}. Retrying ({i + 1}/6)...")
-            time.sleep(2 ** i)
-        print(f"FATAL: Could not shut down server after multiple retries. Exiting.")
-        sys.exit(1)
+                print(f"Shutdown command timed out at iteration {iteration}. Retrying ({i + 1}/{SHUTDOWN_ATTEMPTS})...")
+            # The server may still be going down on its own; retry only if it has not exited.
+            if _wait_for_exit(server_process, pidfd, SHUTDOWN_RETRY_INTERVAL):
+                return
+        raise ServerShutdownError(f"Could not shut down server after multiple retries at iteration {iteration}.")
 
     def _run_server_workload(self, run_dir: Path, iteration: int, seed: int) -> Optional[Path]:
         """Run the server and workload, return the path to the raw log file."""
         raw_log_file = run_dir / f"out_raw_{iteration}.log"
-        env = {
+        env = {k: str(v) for k, v in self.slot_env.items()}
+        env.update({
             "RANDOM_SEED": str(seed),
             "OUT_FILE": str(raw_log_file)
-        }
+        })
 
         # The user provides the full command for prog_bin, including arguments.
         # We use Popen as it's a long-running background process.
-        server_process = sp.Popen(self.config.prog_bin, shell=True, env=env,
-                                  stdout=sp.DEVNULL, stderr=sp.DEVNULL)
+        server_argv = _expand_argv(self.config.prog_bin_argv, {**os.environ, **env})
+        # Server output goes straight to per-iteration files: the kernel writes them directly,
+        # so there is no pipe to drain and the diagnostics survive a failed iteration.
+        server_stderr_file = run_dir / f"server_stderr_{iteration}.log"
+        with open(run_dir / f"server_stdout_{iteration}.log", 'ab') as server_out, \
+                open(server_stderr_file, 'ab') as server_err:
+            server_process = sp.Popen(server_argv, env=env, stdout=server_out, stderr=server_err)
+        pidfd = _open_pidfd(server_process.pid)
 
         try:
-            if not self._wait_for_server_ready():
-                print(f"Server did not become ready within timeout at iteration {iteration}")
+            if not self._wait_for_server_ready(server_process, pidfd):
+                if server_process.poll() is not None:
+                    print(f"Server exited with code {server_process.returncode} before becoming ready at iteration {iteration}. "
+                          f"See {server_stderr_file}")
+                else:
+                    print(f"Server did not become ready within timeout at iteration {iteration}. See {server_stderr_file}")
                 return None
 
             # The user provides the full command for workload_bin, including arguments.
             # We append the -L flag for per-iteration log directories.
-            workload_cmd = f"{self.config.workload_bin} -L {run_dir / f'workload_output_{iteration}'}"
-            result = self._run_command(workload_cmd, env={"RANDOM_SEED": seed})
+            workload_argv = self.config.workload_bin_argv + ["-L", str(run_dir / f'workload_output_{iteration}')]
+            result = self._run_command(workload_argv, env={"RANDOM_SEED": seed})
             if result.returncode != 0:
                 print(f"Workload failed at iteration {iteration} with exit code {result.returncode}")
                 return None
         finally:
-            self._shutdown_server_with_retries(iteration)
             try:
-                server_process.wait(timeout=10)  # Wait for the process to terminate
-            except sp.TimeoutExpired:
-                print(f"WARN: Server process did not terminate gracefully. Killing.")
-                server_process.kill()
+                self._shutdown_server_with_retries(server_process, pidfd, iteration)
+                if not _wait_for_exit(server_process, pidfd, SERVER_EXIT_TIMEOUT):
+                    print(f"WARN: Server process did not terminate gracefully. Killing.")
+                    server_process.kill()
+                server_process.wait()  # Reap the process
+            finally:
+                if pidfd is not None:
+                    os.close(pidfd)
 
         return raw_log_file
 
@@ -157,20 +283,27 @@ class FuzzRunner:
         result_file = out_dir / "elle_result.txt"
 
         # User provides the base elle command prefix. We append dynamic args.
-        elle_cmd = f"{self.config.elle_bin} {edn_file} --directory {out_dir}"
-
-        with open(result_file, 'w') as f:
-            sp.run(elle_cmd, shell=True, stdout=f, stderr=f)
-
-        with open(result_file, 'r') as f:
-            content = f.read()
-
-        if ELLE_ANOMALY_KEYWORD not in content.lower():
+        full_env = self._command_env()
+        elle_argv = _expand_argv(self.config.elle_bin_argv, full_env) + [str(edn_file), "--directory", str(out_dir)]
+
+        # Tee Elle's output into the result file while scanning it, instead of reading it back.
+        keyword = ELLE_ANOMALY_KEYWORD.encode()
+        anomaly_found = False
+        with open(result_file, 'wb') as f, sp.Popen(elle_argv, stdout=sp.PIPE, stderr=sp.STDOUT, env=full_env) as proc:
+            for line in proc.stdout:
+                f.write(line)
+                if not anomaly_found and keyword in line.lower():
+                    anomaly_found = True
+
+        if not anomaly_found:
             return ELLE_OK
 
-        for d in out_dir.iterdir():
-            if d.is_dir() and d.name != "sccs" and ELLE_REALTIME_KEYWORD not in d.name.lower():
-                return ELLE_VIOLATION
+        # scandir yields names and cached file types without building a Path per entry.
+        with os.scandir(out_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name != "sccs" and ELLE_REALTIME_KEYWORD not in name.lower() and entry.is_dir():
+                    return ELLE_VIOLATION
 
         return ELLE_REALTIME_VIOLATION
 
@@ -180,8 +313,8 @@ class FuzzRunner:
         elle_out_dir = run_dir / f"elle_output_{iteration}"
         elle_out_dir.mkdir(exist_ok=True)
 
-        translator_cmd = f"{self.config.edn_maker_bin} {log_file} {edn_path}"
-        result = self._run_command(translator_cmd)
+        translator_argv = self.config.edn_maker_bin_argv + [str(log_file), str(edn_path)]
+        result = self._run_command(translator_argv)
         if result.returncode != 0:
             print(f"Translator failed at iteration {iteration}:\n{result.stderr}")
             return ELLE_ERROR, None
@@ -190,45 +323,84 @@ class FuzzRunner:
         if classification == ELLE_VIOLATION or not self.config.should_mutate:
             return classification, None
 
-        mutation_count = 1
+        budgets = []
         current_budget = 1
         while current_budget <= self.config.max_mutate_budget:
-            mut_edn_path = run_dir / f"out_mutated_{iteration}_{mutation_count}.edn"
-            mut_elle_dir = run_dir / f"elle_mutated_{iteration}_{mutation_count}"
-            mut_elle_dir.mkdir(exist_ok=True)
+            budgets.append(current_budget)
+            current_budget *= 2
 
-            mutator_cmd = f"{self.config.edn_maker_bin} {log_file} {mut_edn_path} --mutate {current_budget}"
-            result = self._run_command(mutator_cmd)
-            if result.returncode != 0:
-                print(f"Mutator failed for iteration {iteration} (budget {current_budget}):\n{result.stderr}")
-                return ELLE_ERROR, mutation_count
+        # Budgets are independent, so up to mutate_in_flight of them are translated and verified
+        # speculatively in parallel. Results are consumed in budget order and the first violation
+        # wins. A budget is only submitted once a result ahead of it has been consumed, so at most
+        # mutate_in_flight - 1 budgets run past a violation, and none when it is 1.
+        in_flight = self.config.mutate_in_flight
+        with ThreadPoolExecutor(max_workers=in_flight) as executor:
+            pending = deque()
+            submitted = 0
+            for mutation_count in range(1, len(budgets) + 1):
+                while submitted < len(budgets) and len(pending) < in_flight:
+                    submitted += 1
+                    pending.append(executor.submit(self._run_mutation, log_file, run_dir, iteration,
+                                                   submitted, budgets[submitted - 1]))
+                classification = pending.popleft().result()
+                if classification in (ELLE_ERROR, ELLE_VIOLATION):
+                    return classification, mutation_count
+
+        return classification, len(budgets) + 1
+
+    def _run_mutation(self, log_file: Path, run_dir: Path, iteration: int, mutation_count: int, budget: int) -> str:
+        """Translate the trace with a mutation budget and verify the result."""
+        mut_edn_path = run_dir / f"out_mutated_{iteration}_{mutation_count}.edn"
+        mut_elle_dir = run_dir / f"elle_mutated_{iteration}_{mutation_count}"
+        mut_elle_dir.mkdir(exist_ok=True)
+
+        mutator_argv = self.config.edn_maker_bin_argv + [str(log_file), str(mut_edn_path), "--mutate", str(budget)]
+        result = self._run_command(mutator_argv)
+        if result.returncode != 0:
+            print(f"Mutator failed for iteration {iteration} (budget {budget}):\n{result.stderr}")
+            return ELLE_ERROR
 
-            classification = self._run_elle_check(mut_edn_path, mut_elle_dir)
-            if classification == ELLE_VIOLATION:
-                return classification, mutation_count
+        return self._run_elle_check(mut_edn_path, mut_elle_dir)
 
-            mutation_count += 1
-            current_budget *= 2
 
-        return classification, mutation_count
+# --- Pipeline Stages ---
+# Module-level entry points so each stage can be dispatched to its own process pool.
+def run_server_stage(config: FuzzConfig, iteration: int, seed: int) -> Optional[Path]:
+    """Run the server and workload for one iteration and return the raw trace, if any."""
+    run_dir = config.base_log_dir / f"run_{iteration:04d}"
+    run_dir.mkdir(exist_ok=True)
+    return FuzzWorker(config, _worker_slot)._run_server_workload(run_dir, iteration, seed)
 
-    def _update_summary(self, iteration: int, classification: str, seed: int, mutation_count: Optional[int]):
-        """Update the summary file with results from the current iteration."""
-        self.state.counts[classification] += 1
-        if classification == ELLE_VIOLATION and mutation_count:
-            self.state.mutation_stats[iteration] = mutation_count
 
-        log_entry = f"Iteration {iteration:04d}: {classification:<9} (seed: {seed}"
-        if mutation_count:
-            log_entry += f", mutations: {mutation_count})"
-        else:
-            log_entry += ")"
-        self.state.iteration_logs.append(log_entry)
+def run_verify_stage(config: FuzzConfig, iteration: int, log_file: Path) -> Tuple[str, Optional[int]]:
+    """Translate and verify the raw trace of one iteration."""
+    return FuzzWorker(config)._process_trace(log_file, log_file.parent, iteration)
+
+
+# --- Main Runner Class ---
+class FuzzRunner:
+    """Orchestrates the main fuzzing loop."""
+
+    def __init__(self, config: FuzzConfig, jobs: int = 1, verify_jobs: Optional[int] = None):
+        self.config = config
+        self.jobs = max(1, jobs)
+        self.verify_jobs = max(1, verify_jobs if verify_jobs is not None else self.jobs)
+        self.state = FuzzState()
+        # Seeds are drawn up front so workers can pick up iterations in any order and
+        # still get the same seed for the same iteration.
+        rng = random.Random(42)
+        self.seeds: list[int] = [rng.randint(0, 2 ** 32 - 1) for _ in range(config.iterations)]
+        # The config never changes during a run, so it is serialized once for the summary.
+        self.config_json: str = json.dumps(vars(self.config), default=str, indent=2)
+        self.config.base_log_dir.mkdir(parents=True, exist_ok=True)
+        print("FuzzRunner initialized. Log directory:", self.config.base_log_dir)
+
+    def _summary_header(self) -> str:
+        return f"Fuzzing run summary\nStarted at: {self.state.start_time}\nConfig: {self.config_json}\n"
 
-        summary_file_path = self.config.base_log_dir / "summary.txt"
-        header = f"Fuzzing run summary\nStarted at: {self.state.start_time}\nConfig: {json.dumps(vars(self.config), default=str, indent=2)}\n"
+    def _summary_stats(self) -> str:
         stats_list = [
-            f"Iterations completed: {iteration + 1}",
+            f"Iterations completed: {self.state.completed}",
             f"{ELLE_OK}: {self.state.counts[ELLE_OK]}",
             f"{ELLE_VIOLATION}: {self.state.counts[ELLE_VIOLATION]}",
             f"{ELLE_REALTIME_VIOLATION}: {self.state.counts[ELLE_REALTIME_VIOLATION]}",
@@ -240,39 +412,136 @@ class FuzzRunner:
                 f"\n--- Mutation Statistics ---\n"
                 f"Average mutations to find violation: {sum(self.state.mutation_stats.values()) / len(self.state.mutation_stats):.2f}\n"
             )
+        return stats
 
-        body = "\n--- Iteration Log ---\n" + "\n".join(self.state.iteration_logs)
-        with open(summary_file_path, 'w') as f:
-            f.write(header + stats + body)
+    def _start_summary(self):
+        """Write the static header once and start an empty iteration log."""
+        log_dir = self.config.base_log_dir
+        # summary.txt is only written at the end; don't leave a previous run's results in place meanwhile.
+        (log_dir / "summary.txt").unlink(missing_ok=True)
+        (log_dir / "summary_header.txt").write_text(self._summary_header())
+        (log_dir / "stats.txt").write_text(self._summary_stats().lstrip("\n"))
+        open(log_dir / "iteration_log.txt", 'w').close()
 
-    def run(self):
-        """The main fuzzing loop."""
-        for i in tqdm(range(self.config.iterations), desc="Fuzzing", unit="iterations"):
-            run_dir = self.config.base_log_dir / f"run_{i:04d}"
-            run_dir.mkdir(exist_ok=True)
-            run_seed = random.randint(0, 2 ** 32 - 1)
+    def _update_summary(self, iteration: int, classification: str, seed: int, mutation_count: Optional[int]):
+        """Append the current iteration to the log and refresh the small stats file."""
+        self.state.completed += 1
+        self.state.counts[classification] += 1
+        if classification == ELLE_VIOLATION and mutation_count:
+            self.state.mutation_stats[iteration] = mutation_count
 
-            raw_log_file = self._run_server_workload(run_dir, i, run_seed)
-            if not raw_log_file:
-                self._update_summary(i, ELLE_ERROR, run_seed, None)
-                continue
+        log_entry = f"Iteration {iteration:04d}: {classification:<9} (seed: {seed}"
+        if mutation_count:
+            log_entry += f", mutations: {mutation_count})"
+        else:
+            log_entry += ")"
+        self.state.log_entries[iteration] = log_entry
 
-            classification, mutation_count = self._process_trace(raw_log_file, run_dir, i)
-            if classification == ELLE_VIOLATION:
-                print(f"\nVIOLATION found at iteration {i}!")
+        # Only the new line is written; the rest of the log is never rewritten.
+        with open(self.config.base_log_dir / "iteration_log.txt", 'a') as f:
+            f.write(log_entry + "\n")
+        (self.config.base_log_dir / "stats.txt").write_text(self._summary_stats().lstrip("\n"))
 
-            self._update_summary(i, classification, run_seed, mutation_count)
+    def _finish_summary(self):
+        """Combine header, statistics and the iteration log, in iteration order, into summary.txt."""
+        log_dir = self.config.base_log_dir
+        entries = self.state.log_entries
+        body = "\n--- Iteration Log ---\n" + "\n".join(entries[i] for i in sorted(entries))
+        with open(log_dir / "summary.txt", 'w') as f:
+            f.write(self._summary_header() + self._summary_stats() + body)
+
+    def run(self):
+        """The main fuzzing loop."""
+        self._start_summary()
+        try:
+            asyncio.run(self._run_pipeline(self.seeds))
+        finally:
+            self._finish_summary()
+
+    async def _run_pipeline(self, seeds: list[int]):
+        """
+        Run iterations as a two-stage pipeline. The server stage is bounded by the number of
+        server slots; translation and verification run in a separate pool, so iteration N is
+        verified while the server for iteration N+1 boots.
+        """
+        loop = asyncio.get_running_loop()
+        slot_queue = mp.Queue()
+        for slot in range(self.jobs):
+            slot_queue.put(slot)
+
+        server_pool = ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker, initargs=(slot_queue,))
+        verify_pool = ProcessPoolExecutor(max_workers=self.verify_jobs)
+
+        # Only hand the server pool as many iterations as it has slots. Work already queued
+        # inside the pool cannot be cancelled, so this lets a fatal error stop the run promptly.
+        server_slots = asyncio.Semaphore(self.jobs)
+
+        with tqdm(total=len(seeds), desc="Fuzzing", unit="iterations") as progress:
+            async def iteration(i: int, seed: int):
+                await server_slots.acquire()
+                log_file = await loop.run_in_executor(server_pool, run_server_stage, self.config, i, seed)
+                # A failed server stage keeps its slot, so no new iteration starts behind it.
+                server_slots.release()
+                if log_file is None:
+                    classification, mutation_count = ELLE_ERROR, None
+                else:
+                    classification, mutation_count = await loop.run_in_executor(
+                        verify_pool, run_verify_stage, self.config, i, log_file)
+                self._record(i, classification, seed, mutation_count)
+                progress.update(1)
+
+            tasks = [asyncio.ensure_future(iteration(i, seed)) for i, seed in enumerate(seeds)]
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                # After a failure, stop the remaining iterations and collect their outcome so
+                # nothing is left unretrieved when the loop closes.
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                server_pool.shutdown(cancel_futures=True)
+                verify_pool.shutdown(cancel_futures=True)
+
+    def _record(self, iteration: int, classification: str, seed: int, mutation_count: Optional[int]):
+        """Record an iteration result as it arrives. Only the main process writes the summary."""
+        if classification == ELLE_VIOLATION:
+            print(f"\nVIOLATION found at iteration {iteration}!")
+        self._update_summary(iteration, classification, seed, mutation_count)
+
+
+def parse_arguments():
+    """Parses command-line arguments for the runner."""
+    parser = argparse.ArgumentParser(description="Run the IsoFuzz fuzzing loop.")
+    parser.add_argument(
+        "config",
+        type=str,
+        help="Path to the JSON configuration file."
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="Number of servers to run in parallel, each owned by its own worker process."
+    )
+    parser.add_argument(
+        "--verify-jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes translating and verifying traces. Defaults to --jobs."
+    )
+    return parser.parse_args()
 
 
 def main():
-    if len(sys.argv) < 2:
-        print(f"Usage: python3 {sys.argv[0]} <path_to_config.json>")
-        sys.exit(1)
+    args = parse_arguments()
 
     try:
-        config = FuzzConfig(sys.argv[1])
-        runner = FuzzRunner(config)
+        config = FuzzConfig(args.config)
+        runner = FuzzRunner(config, args.jobs, args.verify_jobs)
         runner.run()
+    except ServerShutdownError as e:
+        print(f"FATAL: {e} Exiting.")
+        sys.exit(1)
     except (FileNotFoundError, KeyError) as e:
         print(f"Configuration Error: {e}")
         sys.exit(1)
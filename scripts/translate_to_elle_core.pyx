@@ -0,0 +1,237 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+
+"""
+translate_to_elle_core.pyx - Compiled trace parser for translate_to_elle.py.
+
+This is a C-level port of the parsing loop in `_parse_trace`. It scans the
+raw trace buffer directly instead of going through per-line bytes objects, and
+only creates Python objects for the values that end up in the result.
+
+Build it in place next to the translator with:
+
+    cythonize -i translate_to_elle_core.pyx
+
+The translator falls back to its pure-Python parser when this module is not
+built, so the two implementations must produce identical results.
+"""
+
+from libc.string cimport memchr, memcmp
+
+cdef enum:
+    # Field layout of a trace line: thread, trx, event, table, column, row, last writer.
+    NUM_FIELDS = 7
+    F_TRX = 1
+    F_EVENT = 2
+    F_TABLE = 3
+    F_ROW = 5
+    F_LAST_WRITER = 6
+
+    # Longest digit string that is guaranteed to fit a long long.
+    MAX_FAST_DIGITS = 18
+
+    # Must match translate_to_elle.TABLE_ID_BITS.
+    TABLE_ID_BITS = 32
+
+
+cdef inline bint _is_space(char c) noexcept nogil:
+    return c == b' ' or c == b'\t' or c == b'\n' or c == b'\r' or c == b'\v' or c == b'\f'
+
+
+cdef inline bint _field_is(const char* field, Py_ssize_t n, const char* literal, Py_ssize_t literal_len) noexcept nogil:
+    return n == literal_len and memcmp(field, literal, n) == 0
+
+
+cdef object _parse_int(const char* s, Py_ssize_t n):
+    """Parse an integer field. Returns None where Python's int() would raise."""
+    cdef Py_ssize_t i = 0
+    cdef bint neg = False
+    cdef long long value = 0
+
+    if n > 0 and (s[0] == b'-' or s[0] == b'+'):
+        neg = s[0] == b'-'
+        i = 1
+    if i < n and n - i <= MAX_FAST_DIGITS:
+        while i < n and b'0' <= s[i] <= b'9':
+            value = value * 10 + (s[i] - 48)
+            i += 1
+        if i == n:
+            return -value if neg else value
+
+    # Anything unusual (padding, underscores, huge values) goes through int() for identical semantics.
+    try:
+        return int(s[:n])
+    except ValueError:
+        return None
+
+
+cpdef tuple parse_trace(const unsigned char[::1] data):
+    """
+    Parses a whole trace buffer, e.g. a read-only mmap of the trace file. Returns
+    (transactions, event_time_counter, table_names) with the same structure as the
+    pure-Python parser in translate_to_elle.py.
+    """
+    cdef Py_ssize_t size = data.shape[0]
+    cdef const char* buf = <const char*>&data[0] if size > 0 else NULL
+    cdef Py_ssize_t pos = 0
+    cdef Py_ssize_t line_len, i, nfields, field_start
+    cdef const char* line
+    cdef const char* newline
+    cdef const char* event
+    cdef Py_ssize_t event_len
+    cdef bint is_read
+    cdef Py_ssize_t[NUM_FIELDS] starts
+    cdef Py_ssize_t[NUM_FIELDS] lengths
+    cdef long long event_time_counter = 0
+
+    cdef dict id_map = {}
+    cdef dict transactions = {}
+    cdef dict object_versions = {}
+    # Keyed by the raw table bytes so a table name is only decoded once.
+    cdef dict table_ids = {}
+    cdef list table_names = []
+    cdef dict trx
+    cdef tuple versions
+    cdef list full_history
+    cdef dict positions
+    cdef list observed_history
+    cdef object trx_id, row_id, last_writer_id, canonical_id, obj_id, table, table_id, event_type
+    cdef object idx
+
+    while pos < size:
+        newline = <const char*>memchr(buf + pos, b'\n', size - pos)
+        line = buf + pos
+        line_len = (newline - line) if newline != NULL else size - pos
+        pos += line_len + 1
+        event_time_counter += 1
+
+        while line_len > 0 and _is_space(line[0]):
+            line += 1
+            line_len -= 1
+        while line_len > 0 and _is_space(line[line_len - 1]):
+            line_len -= 1
+        if line_len == 0:
+            continue
+
+        # Split on tabs; lines that do not have exactly NUM_FIELDS fields are skipped.
+        nfields = 0
+        field_start = 0
+        for i in range(line_len + 1):
+            if i == line_len or line[i] == b'\t':
+                if nfields == NUM_FIELDS:
+                    nfields += 1
+                    break
+                starts[nfields] = field_start
+                lengths[nfields] = i - field_start
+                nfields += 1
+                field_start = i + 1
+        if nfields != NUM_FIELDS:
+            continue
+
+        trx_id = _parse_int(line + starts[F_TRX], lengths[F_TRX])
+        if trx_id is None:
+            continue
+        if _field_is(line + starts[F_ROW], lengths[F_ROW], b"N/A", 3):
+            row_id = None
+        else:
+            row_id = _parse_int(line + starts[F_ROW], lengths[F_ROW])
+            if row_id is None:
+                continue
+        last_writer_id = _parse_int(line + starts[F_LAST_WRITER], lengths[F_LAST_WRITER])
+        if last_writer_id is None:
+            continue
+
+        event = line + starts[F_EVENT]
+        event_len = lengths[F_EVENT]
+
+        # Handle PROMOTE as a special directive to update our ID map
+        if _field_is(event, event_len, b"PROMOTE", 7):
+            id_map[last_writer_id] = trx_id
+            if last_writer_id in transactions:
+                transactions[trx_id] = transactions.pop(last_writer_id)
+            continue
+
+        # Resolve the canonical transaction ID for the current event
+        canonical_id = id_map.get(trx_id, trx_id)
+
+        if _field_is(event, event_len, b"BEGIN", 5):
+            trx = transactions.get(canonical_id)
+            if trx is None:
+                transactions[canonical_id] = {'ops': [], 'begin_time': event_time_counter,
+                                              'end_time': -1, 'written_objects': set()}
+            elif trx['begin_time'] == -1:
+                trx['begin_time'] = event_time_counter
+            continue
+
+        if _field_is(event, event_len, b"COMMIT", 6):
+            trx = transactions.get(canonical_id)
+            if trx is not None:
+                trx['end_time'] = event_time_counter
+            continue
+
+        is_read = False
+        if _field_is(event, event_len, b"READ", 4):
+            event_type = "READ"
+            is_read = True
+        elif _field_is(event, event_len, b"UPDATE", 6):
+            event_type = "UPDATE"
+        elif _field_is(event, event_len, b"DELETE", 6):
+            event_type = "DELETE"
+        elif _field_is(event, event_len, b"INSERT", 6):
+            event_type = "INSERT"
+        else:
+            continue
+
+        if row_id is None or _field_is(line + starts[F_TABLE], lengths[F_TABLE], b"N/A", 3):
+            continue
+
+        # The object of atomicity is the row.
+        table = line[starts[F_TABLE]:starts[F_TABLE] + lengths[F_TABLE]]
+        table_id = table_ids.get(table)
+        if table_id is None:
+            table_id = table_ids[table] = len(table_names)
+            table_names.append((<bytes>table).decode('utf-8'))
+        obj_id = (row_id << TABLE_ID_BITS) | table_id
+
+        # Get the correct prefix of the version history for this operation.
+        versions = object_versions.get(obj_id)
+        observed_history = []
+        if event_type != "INSERT":
+            # A read observes the history UP TO the version it read. A version that
+            # isn't tracked must be the initial version of the object.
+            idx = (<dict>versions[1]).get(last_writer_id) if versions is not None else None
+            if idx is not None:
+                observed_history = (<list>versions[0])[:idx + 1]
+            elif last_writer_id != 0:
+                observed_history = [last_writer_id]
+
+        trx = transactions.get(canonical_id)
+        if trx is None:
+            trx = {'ops': [], 'begin_time': -1, 'end_time': -1, 'written_objects': set()}
+            transactions[canonical_id] = trx
+
+        op_data = {
+            'type': event_type,
+            'obj_id': obj_id,
+            'observed_history': observed_history,
+            'value': canonical_id
+        }
+
+        if is_read:
+            (<list>trx['ops']).append(op_data)
+        else:
+            # Only append the logical write operation if we haven't already for this object.
+            if obj_id not in <set>trx['written_objects']:
+                (<list>trx['ops']).append(op_data)
+                (<set>trx['written_objects']).add(obj_id)
+
+            # Always update the global version history to reflect the physical write.
+            if versions is None:
+                object_versions[obj_id] = ([canonical_id], {canonical_id: 0})
+            else:
+                full_history = versions[0]
+                positions = versions[1]
+                if canonical_id not in positions:
+                    positions[canonical_id] = len(full_history)
+                full_history.append(canonical_id)
+
+    return transactions, event_time_counter, table_names